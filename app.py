@@ -1,11 +1,21 @@
+import argparse
 import asyncio
+import contextlib
+import hmac
 import logging
-import aiohttp
 import os
-from config import EMAIL, API_TOKEN
-from state_manager import load_state, save_state
+import signal
+from typing import List, Optional, Set
+from aiohttp import web
+from config import (
+    CHECK_INTERVAL_SECONDS, WEBHOOK_FALLBACK_POLL_SECONDS, FORCE_CHECK, TELEGRAM_CHAT_IDS,
+    WEBHOOK_PORT, WEBHOOK_SECRET, WEBHOOK_PUBLIC_URL
+)
+from state_manager import load_state, append_changes, compact
+from clients.http import get_session, close_session
 from clients.jira import JiraClient
 from clients.telegram import TelegramNotifier
+from utils.helpers import is_work_hours
 
 # =========================
 # Logging
@@ -22,64 +32,202 @@ logger = logging.getLogger(__name__)
 # =========================
 
 class JiraMonitor:
+    __slots__ = ("jira", "notifier", "notified_tasks")
+
     def __init__(self, jira: JiraClient, notifier: TelegramNotifier):
         self.jira = jira
         self.notifier = notifier
-        self.notified_tasks = load_state()
+        # Loaded by start(), concurrently with the first Jira search
+        self.notified_tasks: Set[str] = set()
+
+    async def start(self, force: bool = False):
+        # Read the state file while the first Jira search is in flight
+        loading = asyncio.create_task(asyncio.to_thread(load_state))
+        await self._check(force, loading)
+
+    async def check(self, force: bool = False):
+        await self._check(force)
+
+    async def _check(self, force: bool, loading: Optional[asyncio.Task] = None):
+        keys = None
+        # Nothing would be sent anyway, so don't spend a Jira round-trip
+        if force or is_work_hours():
+            logger.info("Starting Jira check...")
+            try:
+                keys = await self.jira.search_keys()
+            except Exception as e:
+                logger.error(f"Error during check: {e}")
+        else:
+            logger.info("Outside work hours. Skipping check.")
+
+        if loading is not None:
+            self.notified_tasks = await loading
+        if keys is not None:
+            await self._process(keys, force)
+
+    async def _process(self, keys: List[str], force: bool):
+        added: Set[str] = set()
+        removed: Set[str] = set()
+        try:
+            current_keys = set(keys)
+
+            # fetch_summaries() returns issues in JQL order, so the set order doesn't matter
+            new_keys = current_keys - self.notified_tasks
+
+            if new_keys:
+                logger.info(f"Found {len(new_keys)} new issues to notify.")
+                new_issues = await self.jira.fetch_summaries(new_keys)
+                await self.notifier.send(new_issues, force=force)
+                added = new_keys
+                self.notified_tasks.update(added)
+            elif keys:
+                logger.info(f"{len(keys)} incomplete tasks found (all previously notified).")
+            else:
+                logger.info("All clean. Clearing state.")
+
+            # Cleanup resolved tasks from state (if they are no longer in the 'incomplete' list).
+            # With no issues this clears the state.
+            removed = self.notified_tasks - current_keys
+            self.notified_tasks -= removed
+            logger.info("Check complete.")
+
+        except Exception as e:
+            logger.error(f"Error during check: {e}")
+
+        finally:
+            # Only the changed keys are written, and only when something changed.
+            # File I/O runs in a worker thread so it doesn't stall the event loop.
+            if added or removed:
+                await asyncio.to_thread(append_changes, added, removed)
+                await asyncio.to_thread(compact, set(self.notified_tasks))
+                logger.info("State updated.")
+
+# =========================
+# Scheduler
+# =========================
+
+async def scheduler_loop(
+    monitor: JiraMonitor,
+    wake: asyncio.Event,
+    interval: float = CHECK_INTERVAL_SECONDS
+):
+    # Every check for the lifetime of the process must go through the one pooled session
+    assert monitor.jira.session is monitor.notifier.session is await get_session()
+
+    # `kill -USR1 <pid>` is a manual run: check now, even outside work hours
+    forced = False
 
-    async def check(self):
-        logger.info("Starting Jira check...")
+    def force_check():
+        nonlocal forced
+        forced = True
+        wake.set()
+
+    with contextlib.suppress(NotImplementedError, AttributeError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, force_check)
+
+    await monitor.start()
+    while True:
         try:
-            issues = await self.jira.search_issues()
+            # Regular poll; in webhook mode a safety net for events Jira failed to deliver
+            await asyncio.wait_for(wake.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        # Wakeups that arrive during the check below leave the event set,
+        # so a burst collapses into one follow-up check
+        wake.clear()
+        force, forced = forced, False
+        await monitor.check(force=force)
 
-            if not issues:
-                logger.info("All clean. Clearing state.")
-                self.notified_tasks.clear()
-                save_state(self.notified_tasks)
-                return
+# =========================
+# Webhook server
+# =========================
 
-            current_keys = {issue["key"] for issue in issues}
+async def serve(monitor: JiraMonitor):
+    wake = asyncio.Event()
 
-            new_issues = [
-                issue for issue in issues
-                if issue["key"] not in self.notified_tasks
-            ]
+    async def handle_webhook(request: web.Request) -> web.Response:
+        # Jira can't send custom headers, so the secret may also come in the query string
+        secret = request.headers.get("X-Webhook-Secret") or request.query.get("secret", "")
+        if not hmac.compare_digest(secret.encode(), WEBHOOK_SECRET.encode()):
+            return web.Response(status=401)
+        wake.set()
+        return web.Response(status=204)
 
-            if new_issues:
-                logger.info(f"Found {len(new_issues)} new issues to notify.")
-                await self.notifier.send(new_issues)
-                for issue in new_issues:
-                    self.notified_tasks.add(issue["key"])
-            else:
-                logger.info(f"{len(issues)} incomplete tasks found (all previously notified).")
+    app = web.Application()
+    app.router.add_post("/jira-webhook", handle_webhook)
 
-            # Cleanup resolved tasks from state (if they are no longer in the 'incomplete' list)
-            self.notified_tasks.intersection_update(current_keys)
-            save_state(self.notified_tasks)
-            logger.info("Check complete and state updated.")
+    # No access log: the request line carries the shared secret in its query string
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=WEBHOOK_PORT).start()
+    logger.info(f"Listening for Jira webhooks on port {WEBHOOK_PORT}.")
 
+    if WEBHOOK_PUBLIC_URL:
+        callback_url = f"{WEBHOOK_PUBLIC_URL.rstrip('/')}/jira-webhook?secret={WEBHOOK_SECRET}"
+        try:
+            if await monitor.jira.register_webhook(callback_url):
+                logger.info("Jira webhook registered.")
         except Exception as e:
-            logger.error(f"Error during check: {e}")
+            logger.error(f"Failed registering Jira webhook: {e}")
+
+    try:
+        await scheduler_loop(monitor, wake, WEBHOOK_FALLBACK_POLL_SECONDS)
+    finally:
+        await runner.cleanup()
 
 # =========================
 # Main
 # =========================
 
-async def main():
-    # It is good practice to ensure sessions are closed properly in serverless environments
-    auth = aiohttp.BasicAuth(EMAIL, API_TOKEN)
+async def main(mode: str = "oneshot", force: bool = FORCE_CHECK):
+    # docker stop sends SIGTERM; cancel so the finally block still closes the session
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
 
-    async with aiohttp.ClientSession(auth=auth) as session:
+    if not TELEGRAM_CHAT_IDS:
+        logger.error("TELEGRAM_CHAT_ID must be set.")
+        return
+
+    try:
+        session = await get_session()
         jira = JiraClient(session)
-        notifier = TelegramNotifier(session)
+        notifier = TelegramNotifier(session, TELEGRAM_CHAT_IDS)
         monitor = JiraMonitor(jira, notifier)
 
-        # We call check() directly instead of the scheduler_loop.
-        # GitHub Actions handles the "scheduling" via the cron in your YAML.
-        await monitor.check()
+        if mode == "webhook":
+            if not WEBHOOK_SECRET:
+                logger.error("WEBHOOK_SECRET must be set to run the webhook server.")
+                return
+            await serve(monitor)
+        elif mode == "loop":
+            await scheduler_loop(monitor, asyncio.Event())
+        else:
+            # We call start() directly instead of the scheduler_loop.
+            # GitHub Actions handles the "scheduling" via the cron in your YAML.
+            await monitor.start(force=force)
+    finally:
+        await close_session()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Jira reminder bot")
+    parser.add_argument(
+        "--mode",
+        choices=("oneshot", "loop", "webhook"),
+        default="oneshot",
+        help="oneshot: single check (GitHub Actions); loop: long-running with hourly polls; "
+             "webhook: long-running, checks on Jira webhook events"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        default=FORCE_CHECK,
+        help="check even outside work hours (oneshot mode)"
+    )
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        asyncio.run(main())
-    except (KeyboardInterrupt, SystemExit):
+        asyncio.run(main(args.mode, args.force))
+    except (KeyboardInterrupt, SystemExit, asyncio.CancelledError):
         logger.info("Jira Bot shutting down...")
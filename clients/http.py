@@ -0,0 +1,33 @@
+import aiohttp
+from typing import Optional
+from config import (
+    EMAIL, API_TOKEN, HTTP_POOL_LIMIT, HTTP_LIMIT_PER_HOST, HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT, HTTP_TOTAL_TIMEOUT, HTTP_CONNECT_TIMEOUT
+)
+
+# One session per process: keep-alive connections and TLS sessions to Jira
+# and Telegram are reused across checks instead of re-handshaking each time.
+_session: Optional[aiohttp.ClientSession] = None
+
+async def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            auth=aiohttp.BasicAuth(EMAIL, API_TOKEN),
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_LIMIT_PER_HOST,
+                use_dns_cache=True,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=True
+            ),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        )
+    return _session
+
+async def close_session() -> None:
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
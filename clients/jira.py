@@ -1,22 +1,90 @@
 import aiohttp
-from typing import List, Dict
-from config import JIRA_URL, JQL
+import asyncio
+import contextlib
+import ijson
+import logging
+import orjson
+from typing import AsyncIterator, Collection, List, Dict
+from config import (
+    JIRA_URL, JQL, JQL_FILTER,
+    JIRA_MAX_RETRIES, JIRA_RETRY_BACKOFF, JIRA_RETRY_STATUSES, JIRA_MAX_RETRY_AFTER
+)
+
+logger = logging.getLogger(__name__)
+
+# The search request never changes, so build and serialize it once.
+# Only keys are needed to diff against the notified state; summaries are
+# fetched separately for the (usually zero) new issues.
+_SEARCH_URL = f"{JIRA_URL}/rest/api/3/search/jql"
+_SEARCH_BODY = orjson.dumps({"jql": JQL, "maxResults": 50, "fields": ["key"]})
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 class JiraClient:
+    __slots__ = ("session",)
+
     def __init__(self, session: aiohttp.ClientSession):
         self.session = session
 
-    async def search_issues(self) -> List[Dict]:
-        url = f"{JIRA_URL}/rest/api/3/search/jql"
+    @contextlib.asynccontextmanager
+    async def _search(self, body: bytes) -> AsyncIterator[aiohttp.ClientResponse]:
+        # Retry throttling and gateway errors with exponential backoff,
+        # honouring Retry-After (capped) when Jira sends one
+        for attempt in range(JIRA_MAX_RETRIES + 1):
+            async with self.session.post(
+                _SEARCH_URL,
+                data=body,
+                headers=_JSON_HEADERS
+            ) as response:
+                if response.status not in JIRA_RETRY_STATUSES or attempt == JIRA_MAX_RETRIES:
+                    response.raise_for_status()
+                    yield response
+                    return
+                retry_after = response.headers.get("Retry-After", "")
+
+            if retry_after.isdigit():
+                delay = min(int(retry_after), JIRA_MAX_RETRY_AFTER)
+            else:
+                delay = JIRA_RETRY_BACKOFF * 2 ** attempt
+            logger.warning(f"Jira returned {response.status}. Retrying in {delay}s.")
+            await asyncio.sleep(delay)
+
+    async def search_keys(self) -> List[str]:
+        async with self._search(_SEARCH_BODY) as response:
+            # Stream the keys out of the body instead of decoding the whole document
+            return [key async for key in ijson.items(response.content, "issues.item.key")]
+
+    async def fetch_summaries(self, keys: Collection[str]) -> List[Dict]:
+        key_list = ", ".join(f'"{key}"' for key in keys)
+
+        async with self._search(orjson.dumps({
+            "jql": f"key IN ({key_list}) ORDER BY updated ASC",
+            "maxResults": len(keys),
+            "fields": ["summary"]
+        })) as response:
+            data = await response.json()
+            return data.get("issues", [])
+
+    async def register_webhook(self, callback_url: str) -> bool:
+        """Registers callback_url for issue events matching our JQL.
+        Returns False if an identical webhook already exists."""
+        url = f"{JIRA_URL}/rest/webhooks/1.0/webhook"
+
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            existing = await response.json()
+
+        if any(hook.get("url") == callback_url for hook in existing):
+            return False
 
         async with self.session.post(
             url,
             json={
-                "jql": JQL,
-                "maxResults": 50,
-                "fields": ["summary"]
+                "name": "jira-reminder-bot",
+                "url": callback_url,
+                "events": ["jira:issue_created", "jira:issue_updated"],
+                "filters": {"issue-related-events-section": JQL_FILTER},
+                "excludeBody": True
             }
         ) as response:
             response.raise_for_status()
-            data = await response.json()
-            return data.get("issues", [])
+        return True
@@ -1,39 +1,88 @@
 import aiohttp
+import asyncio
 import logging
 from typing import List, Dict
-from config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, JIRA_URL
+from config import (
+    TELEGRAM_TOKEN, JIRA_URL, TELEGRAM_MESSAGES_PER_MINUTE,
+    TELEGRAM_CHAT_MESSAGES_PER_SECOND, TELEGRAM_MAX_CONCURRENT_SENDS, TELEGRAM_MAX_RETRY_AFTER
+)
 from utils.helpers import is_work_hours
+from utils.ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
 class TelegramNotifier:
-    def __init__(self, session: aiohttp.ClientSession):
+    __slots__ = ("session", "chat_ids", "url", "rate_limiter")
+
+    def __init__(self, session: aiohttp.ClientSession, chat_ids: List[str]):
         self.session = session
+        self.chat_ids = chat_ids
         self.url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+        self.rate_limiter = RateLimiter(
+            TELEGRAM_MESSAGES_PER_MINUTE, 60,
+            TELEGRAM_CHAT_MESSAGES_PER_SECOND, 1
+        )
 
-    async def send(self, issues: List[Dict]) -> None:
+    async def send(self, issues: List[Dict], force: bool = False) -> None:
         if not issues:
             return
 
-        if not is_work_hours():
+        if not force and not is_work_hours():
             logger.info("Outside work hours. Skipping notification.")
             return
 
-        message = "⚠️ Jira tasks need updating:\n\n"
+        browse_url = f"{JIRA_URL}/browse"
+        parts = ["⚠️ Jira tasks need updating:"]
+        parts.extend(
+            f"• {issue['key']}: {issue['fields'].get('summary', 'No summary')}\n{browse_url}/{issue['key']}"
+            for issue in issues
+        )
+        message = "\n\n".join(parts)
+
+        # Fan out to all chats concurrently, a few requests at a time
+        semaphore = asyncio.Semaphore(TELEGRAM_MAX_CONCURRENT_SENDS)
+
+        async def guarded(chat_id: str) -> None:
+            async with semaphore:
+                await self._send_one(chat_id, message)
+
+        results = await asyncio.gather(
+            *(guarded(chat_id) for chat_id in self.chat_ids),
+            return_exceptions=True
+        )
+        failed = [
+            (chat_id, result) for chat_id, result in zip(self.chat_ids, results)
+            if isinstance(result, Exception)
+        ]
+        for chat_id, error in failed:
+            logger.error(f"Telegram send to {chat_id} failed: {error}")
+
+        delivered = len(self.chat_ids) - len(failed)
+        if not delivered:
+            # Nobody got it: leave the issues un-notified so the next check retries them
+            raise failed[0][1]
+
+        # Once any chat has the message, re-sending would spam the chats that succeeded
+        logger.info(f"Telegram sent ({len(issues)} issues, {delivered}/{len(self.chat_ids)} chats).")
 
-        for issue in issues:
-            key = issue["key"]
-            summary = issue["fields"].get("summary", "No summary")
-            issue_url = f"{JIRA_URL}/browse/{key}"
-            message += f"• {key}: {summary}\n{issue_url}\n\n"
+    async def _send_one(self, chat_id: str, text: str) -> None:
+        payload = {
+            "chat_id": chat_id,
+            "text": text
+        }
 
-        async with self.session.post(
-            self.url,
-            json={
-                "chat_id": TELEGRAM_CHAT_ID,
-                "text": message
-            }
-        ) as response:
-            response.raise_for_status()
+        # On 429, wait as long as Telegram asks (up to a cap) and retry once
+        for attempt in range(2):
+            await self.rate_limiter.acquire(chat_id)
+            async with self.session.post(self.url, json=payload) as response:
+                if response.status != 429 or attempt:
+                    response.raise_for_status()
+                    return
+                data = await response.json()
+                retry_after = data.get("parameters", {}).get("retry_after", 1)
+                if retry_after > TELEGRAM_MAX_RETRY_AFTER:
+                    # Too long to hold up the check; the next check retries
+                    response.raise_for_status()
 
-        logger.info(f"Telegram sent ({len(issues)} issues).")
+            logger.warning(f"Telegram rate limit hit. Retrying in {retry_after}s.")
+            await asyncio.sleep(retry_after)
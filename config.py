@@ -1,6 +1,6 @@
 import os
 from dotenv import load_dotenv
-import pytz
+from zoneinfo import ZoneInfo
 
 # This will try to load .env locally, but won't crash on GitHub
 load_dotenv()
@@ -10,13 +10,48 @@ JIRA_URL = os.getenv("JIRA_URL")
 EMAIL = os.getenv("JIRA_EMAIL")
 API_TOKEN = os.getenv("JIRA_API_TOKEN")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+# One chat id, or several separated by commas
+TELEGRAM_CHAT_IDS = [
+    chat_id.strip() for chat_id in os.getenv("TELEGRAM_CHAT_ID", "").split(",") if chat_id.strip()
+]
 
-STATE_FILE = "notified_state.json"
-CHECK_INTERVAL_SECONDS = 1800  # 30 minutes
-ISRAEL_TZ = pytz.timezone("Asia/Jerusalem")
+# Run the check even outside work hours (manual runs; same as --force)
+FORCE_CHECK = os.getenv("FORCE_CHECK", "false").lower() == "true"
 
-JQL = """
+# Webhook server (--mode webhook)
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+# Public URL Jira should POST to; when set, the webhook is registered on startup
+WEBHOOK_PUBLIC_URL = os.getenv("WEBHOOK_PUBLIC_URL")
+
+STATE_FILE = "notified_state.log"
+CHECK_INTERVAL_SECONDS = 1800  # 30 minutes (--mode loop)
+WEBHOOK_FALLBACK_POLL_SECONDS = 3600  # Safety poll in case webhook events are missed
+
+# HTTP client: only two hosts (Jira + Telegram), so a small per-host pool is plenty
+HTTP_POOL_LIMIT = 20
+HTTP_LIMIT_PER_HOST = 4
+HTTP_DNS_CACHE_TTL = 600  # seconds
+HTTP_KEEPALIVE_TIMEOUT = 75  # seconds
+HTTP_TOTAL_TIMEOUT = 20  # seconds
+HTTP_CONNECT_TIMEOUT = 5  # seconds
+
+# Jira search retries (throttling and gateway errors)
+JIRA_MAX_RETRIES = 3
+JIRA_RETRY_BACKOFF = 0.5  # seconds, doubled on each attempt
+JIRA_RETRY_STATUSES = (429, 502, 503, 504)
+JIRA_MAX_RETRY_AFTER = 60  # seconds; caps the Retry-After Jira asks for
+
+# Telegram send limits (token buckets)
+TELEGRAM_MESSAGES_PER_MINUTE = 30
+TELEGRAM_CHAT_MESSAGES_PER_SECOND = 1
+TELEGRAM_MAX_RETRY_AFTER = 60  # seconds; longer waits give up and leave it to the next check
+TELEGRAM_MAX_CONCURRENT_SENDS = 5
+
+ISRAEL_TZ = ZoneInfo("Asia/Jerusalem")
+
+# Webhook filters don't accept ORDER BY, so the filter is kept separate
+JQL_FILTER = """
 status IN (
   "Ready For Development", 
   "CheckedIn-Pushed", 
@@ -34,5 +69,5 @@ AND (
   OR sprint IS EMPTY
   OR "Project Fizikal" IS EMPTY
 )
-ORDER BY updated ASC
 """
+JQL = JQL_FILTER + "ORDER BY updated ASC\n"
@@ -1,23 +1,56 @@
-import json
 import os
 import logging
-from typing import Set
+from typing import Iterable, Set
 from config import STATE_FILE
 
 logger = logging.getLogger(__name__)
 
+# The state file is an append-only log of "+KEY" / "-KEY" lines, so a check
+# only writes the keys that changed. compact() rewrites it once it has grown
+# well past the live set.
+COMPACT_RATIO = 4
+
 def load_state() -> Set[str]:
     if os.path.exists(STATE_FILE):
         try:
+            state = set()
             with open(STATE_FILE, "r") as f:
-                return set(json.load(f))
+                for line in f:
+                    op, key = line[:1], line[1:].rstrip("\n")
+                    if op == "+":
+                        state.add(key)
+                    elif op == "-":
+                        state.discard(key)
+            return state
         except Exception as e:
             logger.error(f"Failed loading state: {e}")
     return set()
 
+def append_changes(added: Iterable[str], removed: Iterable[str]) -> None:
+    records = [f"+{key}\n" for key in added] + [f"-{key}\n" for key in removed]
+    if not records:
+        return
+    try:
+        with open(STATE_FILE, "a") as f:
+            f.write("".join(records))
+    except Exception as e:
+        logger.error(f"Failed saving state: {e}")
+
 def save_state(state: Set[str]) -> None:
+    # Write to a temp file and swap it in, so a crash never leaves a truncated state file
+    tmp_file = STATE_FILE + ".tmp"
     try:
-        with open(STATE_FILE, "w") as f:
-            json.dump(list(state), f)
+        with open(tmp_file, "w") as f:
+            f.write("".join(f"+{key}\n" for key in state))
+        os.replace(tmp_file, STATE_FILE)
     except Exception as e:
         logger.error(f"Failed saving state: {e}")
+
+def compact(state: Set[str]) -> None:
+    try:
+        size = os.path.getsize(STATE_FILE)
+    except OSError:
+        return
+    live_size = sum(len(key) + 2 for key in state)  # "+KEY\n"
+    if size > COMPACT_RATIO * live_size:
+        save_state(state)
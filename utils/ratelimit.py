@@ -0,0 +1,40 @@
+import asyncio
+import time
+from typing import Dict
+
+class TokenBucket:
+    """Allows `rate` acquisitions per `per` seconds, bursting up to `rate`."""
+
+    def __init__(self, rate: float, per: float):
+        self.capacity = rate
+        self.fill_rate = rate / per
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+
+class RateLimiter:
+    """A global bucket plus one bucket per key (e.g. Telegram chat_id)."""
+
+    def __init__(self, global_rate: float, global_per: float, key_rate: float, key_per: float):
+        self.global_bucket = TokenBucket(global_rate, global_per)
+        self.key_rate = key_rate
+        self.key_per = key_per
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, key: str) -> None:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.key_rate, self.key_per)
+        await bucket.acquire()
+        await self.global_bucket.acquire()